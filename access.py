@@ -0,0 +1,42 @@
+"""Проверка совместного доступа к задачам.
+
+Доступ к чужой задаче даёт либо запись в task_shared, либо запись в
+category_shared для категории задачи. Оба источника разрешаются одним
+запросом с внешними соединениями; при двух правах побеждает 'edit'.
+"""
+from sqlalchemy import and_, or_, case
+
+from models import db, Task, Category, task_shared, category_shared
+
+
+def _permission():
+    edit = or_(task_shared.c.permission == 'edit', category_shared.c.permission == 'edit')
+    return case((edit, 'edit'), else_='view').label('permission')
+
+
+def _with_shared_access(query, user_id):
+    return query.outerjoin(
+        task_shared, and_(task_shared.c.task_id == Task.id, task_shared.c.user_id == user_id)
+    ).outerjoin(
+        # Категория должна принадлежать владельцу задачи, иначе соавтор мог бы
+        # открыть чужую задачу, переложив её в свою общую категорию
+        Category, and_(Category.id == Task.category_id, Category.user_id == Task.user_id)
+    ).outerjoin(
+        category_shared, and_(category_shared.c.category_id == Category.id,
+                              category_shared.c.user_id == user_id)
+    ).filter(
+        Task.user_id != user_id,
+        or_(task_shared.c.user_id.isnot(None), category_shared.c.user_id.isnot(None))
+    )
+
+
+def shared_tasks_query(user_id):
+    """Запрос пар (задача, право) для всех задач, открытых пользователю"""
+    return _with_shared_access(db.session.query(Task, _permission()), user_id)
+
+
+def get_shared_permission(task_id, user_id):
+    """Право пользователя на чужую задачу: 'view', 'edit' или None"""
+    return _with_shared_access(
+        db.session.query(_permission()).select_from(Task), user_id
+    ).filter(Task.id == task_id).scalar()
@@ -0,0 +1,89 @@
+"""Бенчмарк сериализации списков задач: размер ответа и время.
+
+Сравнивает прежний подход (загрузка ORM-объектов и словарь на строку)
+с выборкой только нужных колонок (?fields=) в построчном и колоночном
+(?shape=columns) виде. Используется временная база SQLite.
+
+Запуск из корня проекта:
+    python benchmarks/serialization.py [--rows 5000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from models import db, User, Task  # noqa: E402
+from serializers import select_fields, serialize_rows  # noqa: E402
+
+FIELDS = ['id', 'title', 'status', 'priority']
+
+
+def legacy(app, user_id):
+    tasks = Task.query.filter_by(user_id=user_id).all()
+    return app.json.dumps([{
+        'id': t.id,
+        'title': t.title,
+        'status': t.status,
+        'priority': t.priority
+    } for t in tasks])
+
+
+def sparse(app, user_id, shape):
+    rows = select_fields(Task.query.filter_by(user_id=user_id), FIELDS).all()
+    return app.json.dumps(serialize_rows(rows, FIELDS, shape))
+
+
+def measure(label, func, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        t0 = time.perf_counter()
+        payload = func()
+        timings.append((time.perf_counter() - t0) * 1000)
+    print(f'{label:<28} {len(payload.encode()):>10} байт   {statistics.median(timings):8.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'bench.db'),
+            'RATELIMIT_ENABLED': False,
+        })
+        with app.app_context():
+            db.create_all()
+            user = User(username='bench', email='bench@example.com')
+            user.set_password('bench')
+            db.session.add(user)
+            db.session.flush()
+            today = date.today()
+            db.session.add_all(Task(
+                title=f'Задача {i}',
+                description='Описание задачи ' * random.randint(1, 20),
+                due_date=today + timedelta(days=random.randint(-30, 90)),
+                priority=random.randint(1, 4),
+                status=random.choice(['active', 'completed', 'archived']),
+                user_id=user.id
+            ) for i in range(args.rows))
+            db.session.commit()
+            user_id = user.id
+
+            print(f'{args.rows} задач, поля {",".join(FIELDS)}, медиана по {args.repeat} запускам\n')
+            measure('ORM + dict на строку', lambda: legacy(app, user_id), args.repeat)
+            measure('?fields= построчно', lambda: sparse(app, user_id, 'rows'), args.repeat)
+            measure('?fields= &shape=columns', lambda: sparse(app, user_id, 'columns'), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Бенчмарк холодного старта: загрузка воркера и латентность первого запроса.
+
+Каждый замер выполняется в отдельном процессе, как при запуске воркера
+gunicorn. Сравниваются запуски с пустым и прогретым кэшем байткода Jinja2,
+а также старый вариант с `db.create_all()` при старте.
+
+Запуск из корня проекта:
+    python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = r'''
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+from models import db
+app = create_app({'WTF_CSRF_ENABLED': False})
+if sys.argv[1] == '1':
+    with app.app_context():
+        db.create_all()
+t1 = time.perf_counter()
+client = app.test_client()
+response = client.get('/login')
+t2 = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({'boot': t1 - t0, 'first_request': t2 - t1}))
+'''
+
+
+def run_worker(env, create_schema):
+    out = subprocess.run(
+        [sys.executable, '-c', WORKER, '1' if create_schema else '0'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(label, runs, env, create_schema=False, clear_cache=None):
+    boots, firsts = [], []
+    for _ in range(runs):
+        if clear_cache:
+            clear_cache()
+        result = run_worker(env, create_schema)
+        boots.append(result['boot'] * 1000)
+        firsts.append(result['first_request'] * 1000)
+    print(f'{label:<40} boot {statistics.median(boots):8.1f} ms   '
+          f'first request {statistics.median(firsts):8.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'jinja_cache')
+        env = dict(os.environ,
+                   DATABASE_URL='sqlite:///' + os.path.join(tmp, 'bench.db'),
+                   JINJA_CACHE_DIR=cache_dir)
+
+        def clear_cache():
+            if os.path.isdir(cache_dir):
+                for name in os.listdir(cache_dir):
+                    os.remove(os.path.join(cache_dir, name))
+
+        print(f'Медиана по {args.runs} запускам\n')
+        measure('create_all при старте, холодный кэш', args.runs, env,
+                create_schema=True, clear_cache=clear_cache)
+        measure('фабрика, холодный кэш Jinja', args.runs, env, clear_cache=clear_cache)
+        run_worker(env, create_schema=False)
+        measure('фабрика, прогретый кэш Jinja', args.runs, env)
+
+
+if __name__ == '__main__':
+    main()
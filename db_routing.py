@@ -0,0 +1,163 @@
+"""Маршрутизация запросов к БД между основной базой и репликой.
+
+Маршруты, помеченные декоратором `read_only`, читают из реплики, если она
+настроена (SQLALCHEMY_REPLICA_URL). Все записи, а также чтения в течение
+REPLICA_RYW_WINDOW секунд после собственной записи пользователя идут в
+основную базу. Если реплика недоступна или её отставание больше
+REPLICA_MAX_LAG секунд, чтение тоже уходит в основную базу.
+
+Отставание измеряется по таблице replica_heartbeat: основная база
+регулярно обновляет в ней отметку времени (`flask db-heartbeat` по cron),
+реплика получает её через репликацию. Считается возраст отметки, а не
+чистая задержка репликации, поэтому отметка должна обновляться заметно
+чаще, чем раз в REPLICA_MAX_LAG секунд, иначе реплика будет считаться
+отстающей и все чтения молча уйдут в основную базу. Значение по
+умолчанию (120 с) рассчитано на запуск из cron раз в минуту.
+
+Для локальной проверки на двух файлах SQLite реплику можно обновить
+командой `flask sync-replica`.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+
+from flask import g, session, has_request_context, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, select
+from sqlalchemy.engine import make_url
+
+REPLICA_BIND = 'replica'
+
+
+def read_only(view):
+    """Помечает маршрут как только читающий: его запросы можно отдать реплике"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Сессия, отправляющая чтения read-only маршрутов в реплику"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self):
+        if not has_request_context() or not g.get('db_read_only'):
+            return False
+        if REPLICA_BIND not in self._db.engines:
+            return False
+        # Несохранённые изменения означают запись — только основная база
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        return current_app.extensions['db_routing'].replica_usable()
+
+
+class ReplicaRouter:
+    """Состояние маршрутизации: окно read-your-writes и проверка отставания"""
+
+    def __init__(self, app, db):
+        self.db = db
+        self.ryw_window = app.config['REPLICA_RYW_WINDOW']
+        self.max_lag = app.config['REPLICA_MAX_LAG']
+        self.check_interval = app.config['REPLICA_LAG_CHECK_INTERVAL']
+        self._checked_at = None
+        self._healthy = False
+        self._lock = threading.Lock()
+
+    def replica_usable(self):
+        written_at = session.get('db_written_at')
+        if written_at is not None and time.time() - written_at < self.ryw_window:
+            return False
+        return self.replica_healthy()
+
+    def replica_healthy(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._healthy
+        with self._lock:
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                lag = self.replica_lag()
+                self._healthy = lag is not None and lag <= self.max_lag
+                self._checked_at = now
+        return self._healthy
+
+    def replica_lag(self):
+        """Отставание реплики в секундах или None, если реплика недоступна"""
+        from models import ReplicaHeartbeat
+
+        try:
+            with self.db.engines[REPLICA_BIND].connect() as conn:
+                beat_at = conn.execute(
+                    select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == 1)
+                ).scalar()
+        except Exception:
+            current_app.logger.warning('Реплика БД недоступна, чтение идёт из основной базы', exc_info=True)
+            return None
+        if beat_at is None:
+            return None
+        return (datetime.utcnow() - beat_at).total_seconds()
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_write(db_session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+
+def _remember_write(response):
+    # Окно read-your-writes: следующие запросы пользователя читают из основной базы
+    if g.get('db_wrote'):
+        session['db_written_at'] = time.time()
+    return response
+
+
+def write_heartbeat(db):
+    """Обновляет отметку времени в основной базе"""
+    from models import ReplicaHeartbeat
+
+    beat = db.session.get(ReplicaHeartbeat, 1)
+    if beat is None:
+        beat = ReplicaHeartbeat(id=1)
+        db.session.add(beat)
+    beat.beat_at = datetime.utcnow()
+    db.session.commit()
+
+
+def init_db_routing(app, db):
+    """Подключает реплику как bind и регистрирует обработчики и CLI-команды"""
+    replica_url = app.config.get('SQLALCHEMY_REPLICA_URL')
+    if not replica_url:
+        return
+
+    app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = replica_url
+    app.extensions['db_routing'] = ReplicaRouter(app, db)
+    app.after_request(_remember_write)
+
+    @app.cli.command('db-heartbeat')
+    def db_heartbeat():
+        write_heartbeat(db)
+        print('✅ Отметка репликации обновлена')
+
+    @app.cli.command('sync-replica')
+    def sync_replica():
+        """Копирует основную SQLite-базу в файл реплики (для локальной проверки)"""
+        primary = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        replica = make_url(replica_url)
+        if primary.get_backend_name() != 'sqlite' or replica.get_backend_name() != 'sqlite':
+            print('❌ sync-replica работает только с SQLite')
+            return
+        write_heartbeat(db)
+        source = sqlite3.connect(db.engines[None].url.database)
+        target = sqlite3.connect(db.engines[REPLICA_BIND].url.database)
+        with target:
+            source.backup(target)
+        source.close()
+        target.close()
+        print('✅ Реплика синхронизирована')
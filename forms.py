@@ -61,4 +61,8 @@ class ShareTaskForm(FlaskForm):
     email = StringField('Email пользователя', validators=[DataRequired(), Email()])
     permission = SelectField('Права доступа',
                             choices=[('view', 'Только просмотр'), ('edit', 'Редактирование')],
-                            default='view')
\ No newline at end of file
+                            default='view')
+
+
+class ShareCategoryForm(ShareTaskForm):
+    """Форма для предоставления доступа ко всем задачам категории"""
@@ -2,8 +2,9 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Ассоциативная таблица для связи задачи и тега (многие-ко-многим)
 task_tags = db.Table('task_tags',
@@ -19,6 +20,15 @@ task_shared = db.Table('task_shared',
                        db.Column('shared_at', db.DateTime, default=datetime.utcnow)
                        )
 
+# Ассоциативная таблица для совместного доступа ко всей категории:
+# право распространяется на все задачи категории, включая новые
+category_shared = db.Table('category_shared',
+                           db.Column('category_id', db.Integer, db.ForeignKey('category.id'), primary_key=True),
+                           db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True, index=True),
+                           db.Column('permission', db.String(20), default='view'),
+                           db.Column('shared_at', db.DateTime, default=datetime.utcnow)
+                           )
+
 
 class User(UserMixin, db.Model):
     """Модель пользователя"""
@@ -62,6 +72,10 @@ class Category(db.Model):
     # Связь с задачами
     tasks = db.relationship('Task', backref='category', lazy=True)
 
+    # Пользователи, которым открыт доступ ко всей категории
+    shared_with = db.relationship('User', secondary=category_shared, lazy=True,
+                                  backref=db.backref('shared_categories', lazy=True))
+
     __table_args__ = (db.UniqueConstraint('name', 'user_id', name='unique_category_per_user'),)
 
 
@@ -93,7 +107,7 @@ class Task(db.Model):
     completed = db.Column(db.Boolean, default=False)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Приоритет (1 - низкий, 2 - средний, 3 - высокий, 4 - критический)
     priority = db.Column(db.Integer, default=2)
@@ -103,7 +117,10 @@ class Task(db.Model):
 
     # Внешние ключи
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=True, index=True)
+
+    # Диапазонный поиск ближайших сроков для напоминаний
+    __table_args__ = (db.Index('ix_task_status_due_date', 'status', 'due_date'),)
 
     def get_priority_name(self):
         priorities = {1: 'Низкий', 2: 'Средний', 3: 'Высокий', 4: 'Критический'}
@@ -123,4 +140,51 @@ class Task(db.Model):
             'completed': 'success',
             'archived': 'secondary'
         }
-        return badges.get(self.status, 'primary')
\ No newline at end of file
+        return badges.get(self.status, 'primary')
+
+
+class ReplicaHeartbeat(db.Model):
+    """Отметка времени для измерения отставания реплики"""
+    __tablename__ = 'replica_heartbeat'
+
+    id = db.Column(db.Integer, primary_key=True)
+    beat_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class CompletionRollup(db.Model):
+    """Число выполненных задач за день в разрезе категории и приоритета"""
+    __tablename__ = 'completion_rollup'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    # 0 - без категории: NULL не участвует в уникальном ограничении
+    category_id = db.Column(db.Integer, nullable=False, default=0)
+    priority = db.Column(db.Integer, nullable=False)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'day', 'category_id', 'priority',
+                                          name='unique_rollup_bucket'),)
+
+
+class ReminderOutbox(db.Model):
+    """Напоминание о сроке задачи, ожидающее отправки"""
+    __tablename__ = 'reminder_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Без внешнего ключа: задачу могут удалить, пока напоминание ждёт отправки
+    task_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # upcoming - срок скоро, overdue - срок прошёл
+    kind = db.Column(db.String(20), nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'due_date', 'kind', name='unique_reminder'),
+        db.Index('ix_reminder_outbox_pending', 'sent_at', 'id'),
+    )
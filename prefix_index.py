@@ -0,0 +1,111 @@
+"""Индексы префиксного поиска для подсказок тегов и категорий.
+
+Имена пользователя хранятся в отсортированном массиве (по casefold-ключу),
+и поиск по префиксу сводится к одному bisect. Индексы живут в памяти
+воркера, строятся лениво при первом запросе и сбрасываются CRUD-маршрутами
+тегов и категорий. Другие воркеры увидят изменения не позже чем через
+SUGGEST_INDEX_TTL секунд. Кэш ограничен SUGGEST_INDEX_MAX_ENTRIES
+индексами: устаревшие и давно не использованные вытесняются.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from models import Category, Tag
+
+
+class PrefixIndex:
+    """Отсортированный массив имён с поиском по префиксу"""
+
+    def __init__(self, items):
+        # items: iterable пар (name, payload)
+        entries = sorted(((name.casefold(), name, payload) for name, payload in items),
+                         key=lambda e: (e[0], e[1]))
+        self._keys = [e[0] for e in entries]
+        self._payloads = [e[2] for e in entries]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def suggest(self, prefix, limit=10):
+        """Возвращает до limit элементов, имена которых начинаются с prefix"""
+        prefix = prefix.casefold()
+        start = bisect_left(self._keys, prefix)
+        result = []
+        for i in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[i].startswith(prefix):
+                break
+            result.append(self._payloads[i])
+        return result
+
+
+def _load_tags(user_id):
+    rows = Tag.query.with_entities(Tag.id, Tag.name, Tag.color).filter_by(user_id=user_id).all()
+    return [(name, {'id': id, 'name': name, 'color': color}) for id, name, color in rows]
+
+
+def _load_categories(user_id):
+    rows = Category.query.with_entities(
+        Category.id, Category.name, Category.color, Category.icon
+    ).filter_by(user_id=user_id).all()
+    return [(name, {'id': id, 'name': name, 'color': color, 'icon': icon})
+            for id, name, color, icon in rows]
+
+
+class SuggestIndexRegistry:
+    """Кэш индексов по (вид, пользователь) в памяти воркера"""
+
+    loaders = {
+        'tag': _load_tags,
+        'category': _load_categories,
+    }
+
+    def __init__(self, ttl=60, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Порядок ключей — от давно использованных к недавним (LRU)
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, user_id):
+        key = (kind, user_id)
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._indexes.move_to_end(key)
+                return entry[1]
+
+        index = PrefixIndex(self.loaders[kind](user_id))
+        with self._lock:
+            self._indexes[key] = (time.monotonic(), index)
+            self._indexes.move_to_end(key)
+            self._evict()
+        return index
+
+    def _evict(self):
+        """Удаляет устаревшие индексы, а при переполнении — давно не использованные"""
+        if len(self._indexes) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for key in [k for k, (built_at, _) in self._indexes.items() if now - built_at >= self.ttl]:
+            del self._indexes[key]
+        while len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+
+    def invalidate(self, kind, user_id):
+        with self._lock:
+            self._indexes.pop((kind, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+suggest_indexes = SuggestIndexRegistry()
+
+
+def init_suggest_indexes(app):
+    """Настройка времени жизни и размера кэша индексов из конфигурации"""
+    suggest_indexes.ttl = app.config.get('SUGGEST_INDEX_TTL', 60)
+    suggest_indexes.max_entries = app.config.get('SUGGEST_INDEX_MAX_ENTRIES', 1000)
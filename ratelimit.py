@@ -0,0 +1,185 @@
+"""Ограничение частоты и параллельности запросов, общее для всех воркеров.
+
+Счётчики хранятся в локальном файле SQLite (RATELIMIT_STORAGE), поэтому
+лимиты действуют сразу на все воркеры gunicorn одного сервера.
+
+Частота ограничивается token bucket по ключу (маршрут, пользователь):
+корзина вмещает BURST токенов и пополняется со скоростью PER_MINUTE в
+минуту. Параллельность ограничивается числом одновременно выполняющихся
+запросов одного пользователя (USER_CONCURRENCY), чтобы один клиент не
+занял все слоты, и общим числом запросов к маршруту (CONCURRENCY), чтобы
+маршрут не занял все воркеры. Слоты упавших воркеров освобождаются через
+RATELIMIT_SLOT_TTL секунд. При превышении возвращается 429 с заголовком
+Retry-After.
+
+Лимиты маршрута задаются в конфигурации ключами
+RATELIMIT_<ИМЯ>_PER_MINUTE, _BURST, _CONCURRENCY и _USER_CONCURRENCY,
+где имя передаётся в декоратор: `@rate_limit('SEARCH')`.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import wraps
+
+from flask import current_app, request, jsonify
+from flask_login import current_user
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inflight (
+    id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    started REAL NOT NULL,
+    PRIMARY KEY (id, key)
+);
+CREATE INDEX IF NOT EXISTS ix_inflight_key ON inflight (key, started);
+"""
+
+
+class RateLimitStore:
+    """Хранилище счётчиков в SQLite, одно соединение на поток"""
+
+    def __init__(self, path, slot_ttl=60):
+        self.path = path
+        self.slot_ttl = slot_ttl
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # После fork соединение родителя использовать нельзя
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def consume(self, key, rate, burst):
+        """Забирает токен. Возвращает 0 или число секунд до следующего токена"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM bucket WHERE key = ?', (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0
+            else:
+                retry_after = (1 - tokens) / rate
+            conn.execute('INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)',
+                         (key, tokens, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def acquire(self, limits):
+        """Занимает по слоту под каждым ключом из пар (ключ, лимит) — все или ни одного.
+
+        Возвращает id занятых слотов или None, если хотя бы один лимит исчерпан.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            slot_id = uuid.uuid4().hex
+            for key, limit in limits:
+                conn.execute('DELETE FROM inflight WHERE key = ? AND started < ?', (key, now - self.slot_ttl))
+                busy = conn.execute('SELECT COUNT(*) FROM inflight WHERE key = ?', (key,)).fetchone()[0]
+                if busy >= limit:
+                    slot_id = None
+                    break
+            if slot_id is not None:
+                conn.executemany('INSERT INTO inflight (id, key, started) VALUES (?, ?, ?)',
+                                 [(slot_id, key, now) for key, _ in limits])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return slot_id
+
+    def release(self, slot_id):
+        self._connect().execute('DELETE FROM inflight WHERE id = ?', (slot_id,))
+
+
+def _too_many_requests(retry_after):
+    response = jsonify({'error': 'Слишком много запросов, попробуйте позже'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limit(name):
+    """Ограничивает частоту запросов пользователя и параллельность маршрута.
+
+    Лимиты читаются из конфигурации RATELIMIT_<name>_*. Ставится после
+    @login_required: ключи строятся по current_user.id.
+    """
+    prefix = f'RATELIMIT_{name}_'
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            store = current_app.extensions.get('ratelimit')
+            if store is None:
+                return view(*args, **kwargs)
+
+            config = current_app.config
+            per_minute = config[prefix + 'PER_MINUTE']
+            user_key = f'{request.endpoint}:{current_user.id}'
+
+            try:
+                retry_after = store.consume(user_key, per_minute / 60.0,
+                                            config.get(prefix + 'BURST') or per_minute)
+            except sqlite3.Error:
+                # Недоступное хранилище счётчиков не должно ронять приложение
+                current_app.logger.warning('Хранилище лимитов недоступно', exc_info=True)
+                return view(*args, **kwargs)
+            if retry_after:
+                return _too_many_requests(retry_after)
+
+            limits = []
+            if config.get(prefix + 'USER_CONCURRENCY'):
+                limits.append((user_key, config[prefix + 'USER_CONCURRENCY']))
+            if config.get(prefix + 'CONCURRENCY'):
+                limits.append((request.endpoint, config[prefix + 'CONCURRENCY']))
+            if not limits:
+                return view(*args, **kwargs)
+
+            try:
+                slot_id = store.acquire(limits)
+            except sqlite3.Error:
+                current_app.logger.warning('Хранилище лимитов недоступно', exc_info=True)
+                return view(*args, **kwargs)
+            if slot_id is None:
+                return _too_many_requests(1)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                try:
+                    store.release(slot_id)
+                except sqlite3.Error:
+                    # Слот освободится сам через RATELIMIT_SLOT_TTL
+                    current_app.logger.warning('Не удалось освободить слот лимита', exc_info=True)
+        return wrapper
+    return decorator
+
+
+def init_rate_limit(app):
+    """Подключает общее хранилище счётчиков, если ограничения включены"""
+    if not app.config.get('RATELIMIT_ENABLED'):
+        return
+    path = app.config['RATELIMIT_STORAGE']
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    app.extensions['ratelimit'] = RateLimitStore(path, app.config['RATELIMIT_SLOT_TTL'])
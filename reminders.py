@@ -0,0 +1,333 @@
+"""Напоминания о сроках задач через таблицу-outbox.
+
+`ReminderScheduler` держит в куче ближайшие срабатывания: напоминание
+'upcoming' за REMINDER_LEAD_HOURS часов до начала дня срока и 'overdue' в
+начале следующего за сроком дня (время UTC). В кучу загружается только
+окно сроков на REMINDER_LOOKAHEAD_HOURS вперёд — диапазонным запросом по
+индексу (status, due_date) с keyset-пагинацией. Созданные и изменённые
+после загрузки задачи подхватываются запросом по индексу updated_at.
+Перед записью в outbox задача перепроверяется, а уникальный ключ
+(task_id, due_date, kind) исключает повторы.
+
+`OutboxDrainer` пачками отдаёт неотправленные записи отправителю
+(REMINDER_SENDER) и помечает их отправленными.
+
+Запуск: `flask reminders run` (постоянный процесс) или `flask reminders
+tick` и `flask reminders drain` по cron.
+"""
+import heapq
+import json
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import import_string
+
+from models import db, Task, ReminderOutbox
+
+UPCOMING = 'upcoming'
+OVERDUE = 'overdue'
+
+
+def _day_start(day):
+    return datetime(day.year, day.month, day.day)
+
+
+class ReminderScheduler:
+    """Куча ближайших напоминаний, пополняемая окнами по сроку"""
+
+    def __init__(self, lead=timedelta(hours=24), lookahead=timedelta(hours=24), page_size=1000):
+        self.lead = lead
+        self.lookahead = lookahead
+        self.page_size = page_size
+        self._heap = []
+        self._queued = set()
+        # Сроки в [_window_start, _horizon) уже загружены в кучу
+        self._window_start = None
+        self._horizon = None
+        self._last_poll = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def fire_times(self, due_date):
+        start = _day_start(due_date)
+        return ((start - self.lead, UPCOMING), (start + timedelta(days=1), OVERDUE))
+
+    def next_deadline(self):
+        return self._heap[0][0] if self._heap else None
+
+    def _push(self, task_id, due_date, now):
+        for fire_at, kind in self.fire_times(due_date):
+            # Просроченное 'upcoming' уже не нужно: по задаче придёт 'overdue'
+            if kind == UPCOMING and fire_at + self.lead <= now:
+                continue
+            key = (task_id, due_date, kind)
+            if key not in self._queued:
+                self._queued.add(key)
+                heapq.heappush(self._heap, (fire_at, task_id, due_date, kind))
+
+    def _load_window(self, now):
+        if self._window_start is None:
+            # После простоя досылаем 'overdue' за вчерашний срок
+            self._window_start = self._horizon = (now - timedelta(days=1)).date()
+        end = (now + self.lead + self.lookahead).date() + timedelta(days=1)
+        if end <= self._horizon:
+            return
+
+        cursor = None
+        while True:
+            query = Task.query.with_entities(Task.id, Task.due_date).filter(
+                Task.status == 'active',
+                Task.due_date >= self._horizon,
+                Task.due_date < end
+            )
+            if cursor is not None:
+                query = query.filter(tuple_(Task.due_date, Task.id) > cursor)
+            rows = query.order_by(Task.due_date, Task.id).limit(self.page_size).all()
+            for task_id, due_date in rows:
+                self._push(task_id, due_date, now)
+            if len(rows) < self.page_size:
+                break
+            cursor = tuple(rows[-1])
+        self._horizon = end
+
+    def _load_changed(self, since, now):
+        """Задачи, созданные или изменённые после прошлого опроса, в уже загруженном окне"""
+        cursor = None
+        while True:
+            query = Task.query.with_entities(Task.id, Task.due_date, Task.updated_at).filter(
+                Task.updated_at >= since,
+                Task.status == 'active',
+                Task.due_date >= self._window_start,
+                Task.due_date < self._horizon
+            )
+            if cursor is not None:
+                query = query.filter(or_(
+                    Task.updated_at > cursor[0],
+                    and_(Task.updated_at == cursor[0], Task.id > cursor[1])
+                ))
+            rows = query.order_by(Task.updated_at, Task.id).limit(self.page_size).all()
+            for task_id, due_date, _ in rows:
+                self._push(task_id, due_date, now)
+            if len(rows) < self.page_size:
+                break
+            cursor = (rows[-1][2], rows[-1][0])
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            self._queued.discard(entry[1:])
+            due.append(entry)
+        return due
+
+    def tick(self, now=None):
+        """Пополняет кучу и пишет в outbox наступившие напоминания. Возвращает их число"""
+        now = now or datetime.utcnow()
+        poll_since = self._last_poll
+        self._last_poll = now
+        self._load_window(now)
+        if poll_since is not None:
+            # Небольшой запас на рассинхронизацию часов воркеров
+            self._load_changed(poll_since - timedelta(seconds=5), now)
+        # Окно сдвигается вперёд, старые сроки больше не нужны
+        self._window_start = max(self._window_start, (now - timedelta(days=1)).date())
+
+        due = self._pop_due(now)
+        if not due:
+            return 0
+
+        tasks = {t.id: t for t in Task.query.filter(Task.id.in_({e[1] for e in due})).all()}
+        existing = set(db.session.query(
+            ReminderOutbox.task_id, ReminderOutbox.due_date, ReminderOutbox.kind
+        ).filter(ReminderOutbox.task_id.in_(tasks)).all()) if tasks else set()
+
+        rows = []
+        for entry in due:
+            _, task_id, due_date, kind = entry
+            task = tasks.get(task_id)
+            # Задачу могли выполнить, удалить или перенести после загрузки в кучу
+            if task is None or task.status != 'active' or task.due_date != due_date:
+                continue
+            if (task_id, due_date, kind) in existing:
+                continue
+            rows.append((entry, dict(task_id=task_id, user_id=task.user_id, kind=kind,
+                                     due_date=due_date, title=task.title)))
+        return self._write_outbox(rows)
+
+    def _write_outbox(self, rows):
+        """Пишет строки outbox пачкой, а при конфликте с другим процессом — по одной"""
+        try:
+            db.session.add_all(ReminderOutbox(**values) for _, values in rows)
+            db.session.commit()
+            return len(rows)
+        except IntegrityError:
+            # Часть напоминаний уже записал другой процесс планировщика
+            db.session.rollback()
+        except Exception:
+            # Снятые с кучи напоминания возвращаем, иначе окно их уже не загрузит
+            db.session.rollback()
+            self._requeue([entry for entry, _ in rows])
+            raise
+
+        created = 0
+        for i, (_, values) in enumerate(rows):
+            db.session.add(ReminderOutbox(**values))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                continue
+            except Exception:
+                db.session.rollback()
+                self._requeue([entry for entry, _ in rows[i:]])
+                raise
+            created += 1
+        return created
+
+    def _requeue(self, entries):
+        for entry in entries:
+            if entry[1:] not in self._queued:
+                self._queued.add(entry[1:])
+                heapq.heappush(self._heap, entry)
+
+
+class OutboxDrainer:
+    """Пачками передаёт неотправленные напоминания отправителю"""
+
+    def __init__(self, sender, batch_size=100, max_attempts=5):
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    def drain(self):
+        """Отправляет все ожидающие напоминания. Возвращает число отправленных"""
+        sent_total = 0
+        last_id = 0
+        while True:
+            batch = ReminderOutbox.query.filter(
+                ReminderOutbox.sent_at.is_(None),
+                ReminderOutbox.attempts < self.max_attempts,
+                ReminderOutbox.id > last_id
+            ).order_by(ReminderOutbox.id).limit(self.batch_size).all()
+            if not batch:
+                return sent_total
+            last_id = batch[-1].id
+
+            try:
+                sent_ids = set(self.sender.send(batch))
+                error = 'Отправитель не подтвердил доставку'
+            except Exception as e:
+                current_app.logger.warning('Ошибка отправки напоминаний', exc_info=True)
+                sent_ids, error = set(), str(e)
+
+            now = datetime.utcnow()
+            for reminder in batch:
+                if reminder.id in sent_ids:
+                    reminder.sent_at = now
+                else:
+                    reminder.attempts += 1
+                    reminder.last_error = error
+            db.session.commit()
+            sent_total += len(sent_ids)
+
+
+class LogSender:
+    """Пишет напоминания в лог приложения"""
+
+    def __init__(self, app):
+        self.logger = app.logger
+
+    def send(self, reminders):
+        for r in reminders:
+            self.logger.info('Напоминание %s: задача %s «%s», срок %s, пользователь %s',
+                             r.kind, r.task_id, r.title, r.due_date, r.user_id)
+        return [r.id for r in reminders]
+
+
+class JsonlSender:
+    """Дописывает напоминания в файл REMINDER_OUTBOX_FILE, по JSON-объекту в строке"""
+
+    def __init__(self, app):
+        self.path = app.config['REMINDER_OUTBOX_FILE']
+
+    def send(self, reminders):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for r in reminders:
+                f.write(json.dumps({
+                    'id': r.id,
+                    'kind': r.kind,
+                    'task_id': r.task_id,
+                    'user_id': r.user_id,
+                    'title': r.title,
+                    'due_date': r.due_date.isoformat(),
+                }, ensure_ascii=False) + '\n')
+        return [r.id for r in reminders]
+
+
+SENDERS = {
+    'log': LogSender,
+    'jsonl': JsonlSender,
+}
+
+
+def make_sender(app):
+    """Отправитель из REMINDER_SENDER: 'log', 'jsonl' или путь 'module:Class'"""
+    name = app.config['REMINDER_SENDER']
+    sender_class = SENDERS.get(name) or import_string(name)
+    return sender_class(app)
+
+
+def make_scheduler(app):
+    return ReminderScheduler(lead=timedelta(hours=app.config['REMINDER_LEAD_HOURS']),
+                             lookahead=timedelta(hours=app.config['REMINDER_LOOKAHEAD_HOURS']))
+
+
+def make_drainer(app):
+    return OutboxDrainer(make_sender(app), batch_size=app.config['REMINDER_BATCH_SIZE'])
+
+
+reminders_cli = AppGroup('reminders', help='Напоминания о сроках задач')
+
+
+@reminders_cli.command('tick')
+def tick_command():
+    """Один проход планировщика"""
+    count = make_scheduler(current_app).tick()
+    print(f'✅ Новых напоминаний: {count}')
+
+
+@reminders_cli.command('drain')
+def drain_command():
+    """Отправка накопившихся напоминаний"""
+    count = make_drainer(current_app).drain()
+    print(f'✅ Отправлено напоминаний: {count}')
+
+
+@reminders_cli.command('run')
+@click.option('--poll-interval', default=60, show_default=True,
+              help='Как часто (сек.) искать новые и изменённые задачи')
+def run_command(poll_interval):
+    """Постоянный процесс: планировщик и отправка"""
+    app = current_app._get_current_object()
+    scheduler = make_scheduler(app)
+    drainer = make_drainer(app)
+    while True:
+        scheduler.tick()
+        drainer.drain()
+        db.session.remove()
+
+        wait = poll_interval
+        deadline = scheduler.next_deadline()
+        if deadline is not None:
+            wait = min(wait, max(0.0, (deadline - datetime.utcnow()).total_seconds()))
+        time.sleep(wait)
+
+
+def init_reminders(app):
+    app.cli.add_command(reminders_cli)
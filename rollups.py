@@ -0,0 +1,129 @@
+"""Инкрементальные дневные сводки по выполненным задачам.
+
+Задача считается выполненной, если её статус 'completed' и задано
+completed_at; она учитывается в сводке за день completed_at (UTC) с
+категорией и приоритетом задачи. Маршруты, меняющие задачу, снимают
+ключ до изменения и после (`completion_key`) и передают оба в
+`apply_change` в той же транзакции. Страница аналитики читает только
+сводки, поэтому год истории — не больше 365 строк на разрез.
+"""
+from datetime import date, timedelta
+
+import click
+from sqlalchemy import func
+
+from models import db, Task, CompletionRollup
+
+
+def completion_key(task):
+    """Ключ сводки, в которой учтена задача, или None"""
+    if task.status != 'completed' or task.completed_at is None:
+        return None
+    return (task.user_id, task.completed_at.date(), task.category_id or 0, task.priority or 2)
+
+
+def _bump(key, delta):
+    user_id, day, category_id, priority = key
+    bucket = CompletionRollup.query.filter_by(
+        user_id=user_id, day=day, category_id=category_id, priority=priority
+    )
+    updated = bucket.update({CompletionRollup.completed: CompletionRollup.completed + delta},
+                            synchronize_session=False)
+    if not updated:
+        # Отрицательную строку не создаём: задача была выполнена до появления
+        # сводок и ещё не учтена (см. backfill-rollups)
+        if delta > 0:
+            db.session.add(CompletionRollup(user_id=user_id, day=day, category_id=category_id,
+                                            priority=priority, completed=delta))
+        return
+    if delta < 0:
+        bucket.filter(CompletionRollup.completed <= 0).delete(synchronize_session=False)
+
+
+def apply_change(before, after):
+    """Переносит задачу из сводки before в сводку after (любой может быть None)"""
+    if before == after:
+        return
+    if before is not None:
+        _bump(before, -1)
+    if after is not None:
+        _bump(after, 1)
+
+
+def drop_category(user_id, category_id):
+    """При удалении категории её сводки переходят в 'без категории'"""
+    rows = CompletionRollup.query.filter_by(user_id=user_id, category_id=category_id).all()
+    for row in rows:
+        _bump((user_id, row.day, 0, row.priority), row.completed)
+        db.session.delete(row)
+
+
+def backfill(user_id=None):
+    """Пересчитывает сводки из истории задач. Возвращает число строк сводок"""
+    rollups = CompletionRollup.query
+    tasks = Task.query.filter(Task.status == 'completed', Task.completed_at.isnot(None))
+    if user_id is not None:
+        rollups = rollups.filter_by(user_id=user_id)
+        tasks = tasks.filter(Task.user_id == user_id)
+    rollups.delete(synchronize_session=False)
+
+    day = func.date(Task.completed_at)
+    rows = tasks.with_entities(
+        Task.user_id, day, func.coalesce(Task.category_id, 0),
+        func.coalesce(Task.priority, 2), func.count()
+    ).group_by(Task.user_id, day, func.coalesce(Task.category_id, 0),
+               func.coalesce(Task.priority, 2)).all()
+
+    db.session.add_all(CompletionRollup(
+        user_id=uid, day=_as_date(d), category_id=cid, priority=prio, completed=count
+    ) for uid, d, cid, prio, count in rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _as_date(value):
+    # func.date() в SQLite возвращает строку 'YYYY-MM-DD'
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def completion_series(user_id, start, end, group=None):
+    """Ряды выполненных задач по дням из сводок.
+
+    group: None, 'category' или 'priority'. Возвращает {ключ разреза: {день: число}}.
+    """
+    columns = [CompletionRollup.day]
+    if group == 'category':
+        columns.append(CompletionRollup.category_id)
+    elif group == 'priority':
+        columns.append(CompletionRollup.priority)
+
+    rows = db.session.query(*columns, func.sum(CompletionRollup.completed)).filter(
+        CompletionRollup.user_id == user_id,
+        CompletionRollup.day >= start,
+        CompletionRollup.day <= end
+    ).group_by(*columns).all()
+
+    series = {}
+    for row in rows:
+        key = row[1] if group else None
+        series.setdefault(key, {})[row[0]] = row[-1]
+    return series
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def init_rollups(app):
+    @app.cli.command('backfill-rollups')
+    @click.option('--if-empty', is_flag=True,
+                  help='Пересчитать, только если сводок ещё нет (для шага release)')
+    def backfill_rollups(if_empty):
+        """Пересчёт сводок по выполненным задачам"""
+        if if_empty and db.session.query(CompletionRollup.query.exists()).scalar():
+            print('Сводки уже заполнены, пересчёт пропущен')
+            return
+        count = backfill()
+        print(f'✅ Сводки пересчитаны: {count} строк')
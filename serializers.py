@@ -0,0 +1,86 @@
+"""Сериализация задач для JSON API.
+
+Клиент выбирает нужные поля параметром `?fields=id,title`, и из БД
+выбираются только соответствующие колонки. Параметр `?shape=columns`
+переключает ответ в колоночный вид — по массиву на поле, — что заметно
+компактнее для длинных списков:
+
+    {"fields": ["id", "title"], "count": 2, "data": {"id": [1, 2], "title": ["a", "b"]}}
+"""
+from datetime import date, datetime
+
+from flask import request, jsonify, abort
+
+from models import Task
+
+# Поля задачи, доступные через API
+TASK_FIELDS = {
+    'id': Task.id,
+    'title': Task.title,
+    'description': Task.description,
+    'due_date': Task.due_date,
+    'priority': Task.priority,
+    'status': Task.status,
+    'completed': Task.completed,
+    'completed_at': Task.completed_at,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at,
+    'category_id': Task.category_id,
+}
+
+SHAPES = ('rows', 'columns')
+
+
+def parse_fields(default, allowed=TASK_FIELDS):
+    """Список полей из ?fields= (или default); неизвестное поле — 400"""
+    raw = request.args.get('fields')
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown or not fields:
+        abort(400, description=f"Неизвестные поля: {', '.join(unknown)}")
+    return fields
+
+
+def parse_shape():
+    shape = request.args.get('shape', 'rows')
+    if shape not in SHAPES:
+        abort(400, description=f'Неизвестный формат ответа: {shape}')
+    return shape
+
+
+def select_fields(query, fields, columns=TASK_FIELDS):
+    """Ограничивает SELECT запрошенными колонками"""
+    return query.with_entities(*(columns[f] for f in fields))
+
+
+def _value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def serialize_rows(rows, fields, shape='rows'):
+    """Кортежи из select_fields в список словарей или колоночный словарь"""
+    if shape == 'columns':
+        data = {f: [] for f in fields}
+        columns = [data[f] for f in fields]
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(_value(value))
+        return {'fields': fields, 'count': len(rows), 'data': data}
+    return [{f: _value(v) for f, v in zip(fields, row)} for row in rows]
+
+
+def serialize_object(obj, fields):
+    """Один объект модели в словарь с запрошенными полями"""
+    return {f: _value(getattr(obj, f)) for f in fields}
+
+
+def json_list(query, default_fields):
+    """Ответ API для списка: поля и формат берутся из параметров запроса"""
+    fields = parse_fields(default_fields)
+    shape = parse_shape()
+    rows = select_fields(query, fields).all()
+    return jsonify(serialize_rows(rows, fields, shape))
@@ -59,6 +59,12 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Подсказки тегов по мере ввода
+    const tagsInput = document.getElementById('tags');
+    if (tagsInput) {
+        initTagSuggest(tagsInput);
+    }
+
     // Копирование ссылки на задачу
     const copyLinkBtns = document.querySelectorAll('.copy-task-link');
     copyLinkBtns.forEach(btn => {
@@ -110,6 +116,63 @@ function displaySearchResults(tasks) {
     resultsContainer.classList.remove('d-none');
 }
 
+function initTagSuggest(input) {
+    const list = document.createElement('div');
+    list.className = 'tag-suggest d-none';
+    input.parentNode.style.position = 'relative';
+    input.parentNode.appendChild(list);
+
+    let timeout = null;
+
+    function currentPrefix() {
+        const parts = input.value.split(',');
+        return parts[parts.length - 1].trim();
+    }
+
+    function applySuggestion(name) {
+        const parts = input.value.split(',').map(p => p.trim());
+        parts[parts.length - 1] = name;
+        input.value = parts.filter(p => p).join(', ') + ', ';
+        list.classList.add('d-none');
+        input.focus();
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timeout);
+        const prefix = currentPrefix();
+
+        if (!prefix) {
+            list.classList.add('d-none');
+            return;
+        }
+
+        timeout = setTimeout(() => {
+            fetch(`/api/tags/suggest?prefix=${encodeURIComponent(prefix)}`)
+                .then(response => response.json())
+                .then(tags => {
+                    list.innerHTML = '';
+                    tags.forEach(tag => {
+                        const item = document.createElement('div');
+                        item.className = 'tag-suggest-item';
+                        item.textContent = tag.name;
+                        item.style.borderLeftColor = tag.color;
+                        item.addEventListener('mousedown', e => {
+                            e.preventDefault();
+                            applySuggestion(tag.name);
+                        });
+                        list.appendChild(item);
+                    });
+                    list.classList.toggle('d-none', tags.length === 0);
+                })
+                .catch(error => {
+                    console.error('Suggest error:', error);
+                });
+        }, 100);
+    });
+
+    input.addEventListener('blur', () => list.classList.add('d-none'));
+}
+
 function getPriorityName(priority) {
     const names = {1: 'Низкий', 2: 'Средний', 3: 'Высокий', 4: 'Критический'};
     return names[priority] || 'Средний';
@@ -0,0 +1,10 @@
+"""Блюпринты приложения"""
+from views import main, tasks, categories, tags, sharing, analytics, api, auth
+
+blueprints = (main.bp, tasks.bp, categories.bp, tags.bp, sharing.bp, analytics.bp, api.bp, auth.bp)
+
+
+def register_blueprints(app):
+    """Регистрация всех блюпринтов в приложении"""
+    for bp in blueprints:
+        app.register_blueprint(bp)
@@ -0,0 +1,80 @@
+"""Аналитика продуктивности по дневным сводкам"""
+from datetime import datetime, timedelta
+from flask import Blueprint, render_template, request, jsonify, abort
+from flask_login import login_required, current_user
+from db_routing import read_only
+from models import Task, Category
+from rollups import completion_series, week_start
+
+bp = Blueprint('analytics', __name__)
+
+PERIODS = ('day', 'week')
+GROUPS = ('none', 'category', 'priority')
+MAX_DAYS = 366
+
+
+@bp.route('/analytics')
+@login_required
+def analytics():
+    return render_template('analytics.html')
+
+
+@bp.route('/api/analytics/completions')
+@login_required
+@read_only
+def completions_chart():
+    """Данные для графика выполненных задач: только из сводок"""
+    period = request.args.get('period', 'day')
+    group = request.args.get('group', 'none')
+    days = request.args.get('days', 30, type=int)
+    if period not in PERIODS or group not in GROUPS or not 1 <= days <= MAX_DAYS:
+        abort(400)
+
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
+    series = completion_series(current_user.id, start, end, None if group == 'none' else group)
+
+    if period == 'week':
+        start = week_start(start)
+        buckets = [start + timedelta(weeks=i) for i in range((end - start).days // 7 + 1)]
+        series = {key: _by_week(values) for key, values in series.items()}
+    else:
+        buckets = [start + timedelta(days=i) for i in range(days)]
+
+    labels = _group_labels(group, series.keys())
+    return jsonify({
+        'period': period,
+        'labels': [b.isoformat() for b in buckets],
+        'series': [{
+            'key': key,
+            'label': labels[key][0],
+            'color': labels[key][1],
+            'data': [values.get(b, 0) for b in buckets]
+        } for key, values in sorted(series.items(), key=lambda item: item[0] or 0)]
+    })
+
+
+def _by_week(values):
+    weeks = {}
+    for day, count in values.items():
+        week = week_start(day)
+        weeks[week] = weeks.get(week, 0) + count
+    return weeks
+
+
+def _group_labels(group, keys):
+    """Подписи и цвета рядов: {ключ: (подпись, цвет)}"""
+    if group == 'category':
+        categories = {c.id: c for c in Category.query.filter_by(user_id=current_user.id).all()}
+        labels = {}
+        for key in keys:
+            category = categories.get(key)
+            if category:
+                labels[key] = (f'{category.icon} {category.name}', category.color)
+            else:
+                labels[key] = ('Без категории', '#9b9a97')
+        return labels
+    if group == 'priority':
+        return {key: (Task(priority=key).get_priority_name(), Task(priority=key).get_priority_color())
+                for key in keys}
+    return {None: ('Выполнено', '#2383e2')}
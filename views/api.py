@@ -0,0 +1,74 @@
+"""API для быстрых действий"""
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import or_
+from db_routing import read_only
+from models import db, Task
+from prefix_index import suggest_indexes
+from ratelimit import rate_limit
+from serializers import parse_fields, parse_shape, serialize_object, serialize_rows, json_list
+
+bp = Blueprint('api', __name__)
+
+# Поля ответа по умолчанию, если клиент не передал ?fields=
+QUICK_ADD_FIELDS = ('id', 'title')
+SEARCH_FIELDS = ('id', 'title', 'status', 'priority')
+
+
+@bp.route('/api/tasks/quick-add', methods=['POST'])
+@login_required
+@rate_limit('QUICK_ADD')
+def quick_add_task():
+    fields = parse_fields(QUICK_ADD_FIELDS)
+    data = request.get_json()
+
+    task = Task(
+        title=data.get('title'),
+        user_id=current_user.id,
+        priority=2,
+        status='active'
+    )
+
+    db.session.add(task)
+    db.session.commit()
+
+    return jsonify(serialize_object(task, fields))
+
+
+@bp.route('/api/tasks/search')
+@login_required
+@rate_limit('SEARCH')
+@read_only
+def search_tasks():
+    query = request.args.get('q', '')
+
+    if not query or len(query) < 2:
+        return jsonify(serialize_rows([], parse_fields(SEARCH_FIELDS), parse_shape()))
+
+    tasks = Task.query.filter(
+        Task.user_id == current_user.id,
+        or_(
+            Task.title.ilike(f'%{query}%'),
+            Task.description.ilike(f'%{query}%')
+        )
+    ).limit(10)
+
+    return json_list(tasks, SEARCH_FIELDS)
+
+
+@bp.route('/api/tags/suggest')
+@login_required
+def suggest_tags():
+    prefix = request.args.get('prefix', '').strip()
+    if not prefix:
+        return jsonify([])
+    return jsonify(suggest_indexes.get('tag', current_user.id).suggest(prefix))
+
+
+@bp.route('/api/categories/suggest')
+@login_required
+def suggest_categories():
+    prefix = request.args.get('prefix', '').strip()
+    if not prefix:
+        return jsonify([])
+    return jsonify(suggest_indexes.get('category', current_user.id).suggest(prefix))
@@ -0,0 +1,78 @@
+"""Управление категориями"""
+from flask import Blueprint, render_template, redirect, url_for, flash, abort
+from flask_login import login_required, current_user
+from models import db, Task, Category
+from forms import CategoryForm
+from prefix_index import suggest_indexes
+from rollups import drop_category
+
+bp = Blueprint('categories', __name__)
+
+
+@bp.route('/categories')
+@login_required
+def list_categories():
+    categories = Category.query.filter_by(user_id=current_user.id).all()
+    return render_template('category/list.html', categories=categories)
+
+
+@bp.route('/category/add', methods=['GET', 'POST'])
+@login_required
+def add_category():
+    form = CategoryForm()
+
+    if form.validate_on_submit():
+        category = Category(
+            name=form.name.data,
+            color=form.color.data,
+            icon=form.icon.data,
+            user_id=current_user.id
+        )
+        db.session.add(category)
+        db.session.commit()
+        suggest_indexes.invalidate('category', current_user.id)
+        flash('Категория создана!', 'success')
+        return redirect(url_for('.list_categories'))
+
+    return render_template('category/add.html', form=form)
+
+
+@bp.route('/category/edit/<int:id>', methods=['GET', 'POST'])
+@login_required
+def edit_category(id):
+    category = Category.query.get_or_404(id)
+
+    if category.user_id != current_user.id:
+        abort(403)
+
+    form = CategoryForm(obj=category)
+
+    if form.validate_on_submit():
+        category.name = form.name.data
+        category.color = form.color.data
+        category.icon = form.icon.data
+        db.session.commit()
+        suggest_indexes.invalidate('category', current_user.id)
+        flash('Категория обновлена!', 'success')
+        return redirect(url_for('.list_categories'))
+
+    return render_template('category/edit.html', form=form, category=category)
+
+
+@bp.route('/category/delete/<int:id>')
+@login_required
+def delete_category(id):
+    category = Category.query.get_or_404(id)
+
+    if category.user_id != current_user.id:
+        abort(403)
+
+    # Обновляем задачи, убирая категорию
+    Task.query.filter_by(category_id=id).update({Task.category_id: None})
+    drop_category(current_user.id, id)
+
+    db.session.delete(category)
+    db.session.commit()
+    suggest_indexes.invalidate('category', current_user.id)
+    flash('Категория удалена', 'success')
+    return redirect(url_for('.list_categories'))
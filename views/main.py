@@ -0,0 +1,85 @@
+"""Главные страницы: лендинг, список задач и календарь"""
+from datetime import datetime
+from flask import Blueprint, render_template, redirect, url_for, request
+from flask_login import login_required, current_user
+from db_routing import read_only
+from models import Task, Category, Tag
+from access import shared_tasks_query
+
+bp = Blueprint('main', __name__)
+
+
+@bp.route('/')
+def index():
+    if current_user.is_authenticated:
+        return redirect(url_for('.dashboard'))
+    return render_template('index.html')
+
+
+@bp.route('/dashboard')
+@login_required
+@read_only
+def dashboard():
+    # Получаем параметры фильтрации
+    filter_status = request.args.get('status', 'active')
+    filter_category = request.args.get('category', 'all')
+    filter_priority = request.args.get('priority', 'all')
+
+    # Базовый запрос
+    query = Task.query.filter_by(user_id=current_user.id)
+
+    # Применяем фильтры
+    if filter_status != 'all':
+        query = query.filter_by(status=filter_status)
+
+    if filter_category != 'all' and filter_category.isdigit():
+        query = query.filter_by(category_id=int(filter_category))
+
+    if filter_priority != 'all' and filter_priority.isdigit():
+        query = query.filter_by(priority=int(filter_priority))
+
+    tasks = query.order_by(Task.priority.desc(), Task.due_date).all()
+
+    # Получаем категории и теги для фильтров
+    categories = Category.query.filter_by(user_id=current_user.id).all()
+    tags = Tag.query.filter_by(user_id=current_user.id).all()
+
+    # Статистика
+    stats = {
+        'total': Task.query.filter_by(user_id=current_user.id).count(),
+        'active': Task.query.filter_by(user_id=current_user.id, status='active').count(),
+        'completed': Task.query.filter_by(user_id=current_user.id, status='completed').count(),
+        'overdue': Task.query.filter(
+            Task.user_id == current_user.id,
+            Task.status == 'active',
+            Task.due_date < datetime.now().date()
+        ).count()
+    }
+
+    return render_template('dashboard.html',
+                           tasks=tasks,
+                           categories=categories,
+                           tags=tags,
+                           stats=stats,
+                           filter_status=filter_status,
+                           filter_category=filter_category,
+                           filter_priority=filter_priority)
+
+
+@bp.route('/calendar')
+@login_required
+@read_only
+def calendar():
+    tasks = Task.query.filter(
+        Task.user_id == current_user.id,
+        Task.due_date.isnot(None)
+    ).all()
+
+    # Также добавляем задачи, к которым есть доступ
+    shared_tasks = [task for task, permission in shared_tasks_query(current_user.id).filter(
+        Task.due_date.isnot(None)
+    ).all()]
+
+    all_tasks = tasks + shared_tasks
+
+    return render_template('calendar.html', tasks=all_tasks)
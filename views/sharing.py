@@ -0,0 +1,166 @@
+"""Совместная работа над задачами и категориями"""
+from flask import Blueprint, render_template, redirect, url_for, flash, abort
+from flask_login import login_required, current_user
+from db_routing import read_only
+from models import db, User, Task, Category, task_shared, category_shared
+from forms import ShareTaskForm, ShareCategoryForm
+from access import shared_tasks_query
+
+bp = Blueprint('sharing', __name__)
+
+
+@bp.route('/task/<int:id>/share', methods=['GET', 'POST'])
+@login_required
+def share_task(id):
+    task = Task.query.get_or_404(id)
+
+    if task.user_id != current_user.id:
+        abort(403)
+
+    form = ShareTaskForm()
+
+    if form.validate_on_submit():
+        user = User.query.filter_by(email=form.email.data).first()
+        if not user:
+            flash('Пользователь с таким email не найден', 'danger')
+            return render_template('task/share.html', form=form, task=task)
+
+        if user.id == current_user.id:
+            flash('Нельзя поделиться задачей с самим собой', 'warning')
+            return render_template('task/share.html', form=form, task=task)
+
+        # Проверяем, не поделились ли уже
+        existing = db.session.query(task_shared).filter_by(
+            task_id=id, user_id=user.id
+        ).first()
+
+        if existing:
+            flash('Задача уже доступна этому пользователю', 'info')
+            return redirect(url_for('tasks.view_task', id=task.id))
+
+        # Добавляем запись о совместном доступе
+        stmt = task_shared.insert().values(
+            task_id=id,
+            user_id=user.id,
+            permission=form.permission.data
+        )
+        db.session.execute(stmt)
+        db.session.commit()
+
+        flash(f'Задача доступна пользователю {user.username}', 'success')
+        return redirect(url_for('tasks.view_task', id=task.id))
+
+    # Получаем список пользователей, с кем уже поделились
+    shared_users = db.session.query(User).join(
+        task_shared, (task_shared.c.user_id == User.id)
+    ).filter(task_shared.c.task_id == id).all()
+
+    return render_template('task/share.html', form=form, task=task, shared_users=shared_users)
+
+
+@bp.route('/task/<int:id>/revoke/<int:user_id>')
+@login_required
+def revoke_access(id, user_id):
+    task = Task.query.get_or_404(id)
+
+    if task.user_id != current_user.id:
+        abort(403)
+
+    stmt = task_shared.delete().where(
+        task_shared.c.task_id == id,
+        task_shared.c.user_id == user_id
+    )
+    db.session.execute(stmt)
+    db.session.commit()
+
+    flash('Доступ отозван', 'success')
+    return redirect(url_for('.share_task', id=id))
+
+
+@bp.route('/category/<int:id>/share', methods=['GET', 'POST'])
+@login_required
+def share_category(id):
+    """Доступ ко всем задачам категории, включая будущие"""
+    category = Category.query.get_or_404(id)
+
+    if category.user_id != current_user.id:
+        abort(403)
+
+    form = ShareCategoryForm()
+
+    if form.validate_on_submit():
+        user = User.query.filter_by(email=form.email.data).first()
+        if not user:
+            flash('Пользователь с таким email не найден', 'danger')
+            return render_template('category/share.html', form=form, category=category)
+
+        if user.id == current_user.id:
+            flash('Нельзя поделиться категорией с самим собой', 'warning')
+            return render_template('category/share.html', form=form, category=category)
+
+        existing = db.session.query(category_shared).filter_by(
+            category_id=id, user_id=user.id
+        ).first()
+
+        if existing:
+            # Повторная выдача меняет уровень доступа
+            stmt = category_shared.update().where(
+                category_shared.c.category_id == id,
+                category_shared.c.user_id == user.id
+            ).values(permission=form.permission.data)
+        else:
+            stmt = category_shared.insert().values(
+                category_id=id,
+                user_id=user.id,
+                permission=form.permission.data
+            )
+        db.session.execute(stmt)
+        db.session.commit()
+
+        flash(f'Категория доступна пользователю {user.username}', 'success')
+        return redirect(url_for('.share_category', id=id))
+
+    # Пользователи с доступом к категории и их права
+    shared_users = db.session.query(User, category_shared.c.permission).join(
+        category_shared, (category_shared.c.user_id == User.id)
+    ).filter(category_shared.c.category_id == id).all()
+
+    return render_template('category/share.html', form=form, category=category, shared_users=shared_users)
+
+
+@bp.route('/category/<int:id>/revoke/<int:user_id>')
+@login_required
+def revoke_category_access(id, user_id):
+    category = Category.query.get_or_404(id)
+
+    if category.user_id != current_user.id:
+        abort(403)
+
+    stmt = category_shared.delete().where(
+        category_shared.c.category_id == id,
+        category_shared.c.user_id == user_id
+    )
+    db.session.execute(stmt)
+    db.session.commit()
+
+    flash('Доступ отозван', 'success')
+    return redirect(url_for('.share_category', id=id))
+
+
+@bp.route('/shared-with-me')
+@login_required
+@read_only
+def shared_with_me():
+    # Получаем задачи с доступом напрямую или через категорию
+    tasks_with_permission = shared_tasks_query(current_user.id).all()
+
+    # Преобразуем в список словарей для удобства
+    tasks = []
+    for task, permission in tasks_with_permission:
+        task_data = {
+            'task': task,
+            'permission': permission
+        }
+        tasks.append(task_data)
+
+    return render_template('shared_tasks.html', tasks=tasks)
@@ -0,0 +1,88 @@
+"""Управление тегами"""
+from flask import Blueprint, render_template, redirect, url_for, flash, abort
+from flask_login import login_required, current_user
+from models import db, Tag
+from forms import TagForm
+from prefix_index import suggest_indexes
+
+bp = Blueprint('tags', __name__)
+
+
+@bp.route('/tags')
+@login_required
+def list_tags():
+    """Список тегов"""
+    tags = Tag.query.filter_by(user_id=current_user.id).all()
+    return render_template('tag/list.html', tags=tags)
+
+
+@bp.route('/tag/add', methods=['GET', 'POST'])
+@login_required
+def add_tag():
+    """Добавление нового тега"""
+    form = TagForm()
+
+    if form.validate_on_submit():
+        # Проверяем, существует ли уже такой тег
+        existing = Tag.query.filter_by(user_id=current_user.id, name=form.name.data).first()
+        if existing:
+            flash('Тег с таким именем уже существует', 'danger')
+            return render_template('tag/add.html', form=form)
+
+        tag = Tag(
+            name=form.name.data,
+            color=form.color.data,
+            user_id=current_user.id
+        )
+        db.session.add(tag)
+        db.session.commit()
+        suggest_indexes.invalidate('tag', current_user.id)
+        flash('Тег создан!', 'success')
+        return redirect(url_for('.list_tags'))
+
+    return render_template('tag/add.html', form=form)
+
+
+@bp.route('/tag/edit/<int:id>', methods=['GET', 'POST'])
+@login_required
+def edit_tag(id):
+    """Редактирование тега"""
+    tag = Tag.query.get_or_404(id)
+
+    if tag.user_id != current_user.id:
+        abort(403)
+
+    form = TagForm(obj=tag)
+
+    if form.validate_on_submit():
+        # Проверяем, не занято ли имя другим тегом
+        existing = Tag.query.filter_by(user_id=current_user.id, name=form.name.data).first()
+        if existing and existing.id != id:
+            flash('Тег с таким именем уже существует', 'danger')
+            return render_template('tag/edit.html', form=form, tag=tag)
+
+        tag.name = form.name.data
+        tag.color = form.color.data
+        db.session.commit()
+        suggest_indexes.invalidate('tag', current_user.id)
+        flash('Тег обновлен!', 'success')
+        return redirect(url_for('.list_tags'))
+
+    return render_template('tag/edit.html', form=form, tag=tag)
+
+
+@bp.route('/tag/delete/<int:id>')
+@login_required
+def delete_tag(id):
+    """Удаление тега"""
+    tag = Tag.query.get_or_404(id)
+
+    if tag.user_id != current_user.id:
+        abort(403)
+
+    # Удаляем связи с задачами (автоматически через cascade)
+    db.session.delete(tag)
+    db.session.commit()
+    suggest_indexes.invalidate('tag', current_user.id)
+    flash('Тег удален', 'success')
+    return redirect(url_for('.list_tags'))
@@ -0,0 +1,182 @@
+"""Управление задачами"""
+from datetime import datetime
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from flask_login import login_required, current_user
+from models import db, Task, Category, Tag
+from access import get_shared_permission
+from forms import TaskForm
+from prefix_index import suggest_indexes
+from rollups import completion_key, apply_change
+
+bp = Blueprint('tasks', __name__)
+
+
+@bp.route('/task/add', methods=['GET', 'POST'])
+@login_required
+def add_task():
+    form = TaskForm()
+
+    # Заполняем выпадающий список категорий
+    categories = Category.query.filter_by(user_id=current_user.id).all()
+    form.category_id.choices = [(0, 'Без категории')] + [(c.id, f"{c.icon} {c.name}") for c in categories]
+
+    if form.validate_on_submit():
+        # Обработка тегов
+        tag_names = [t.strip() for t in form.tags.data.split(',')] if form.tags.data else []
+        tags = []
+        new_tags = False
+        for tag_name in tag_names:
+            if tag_name:
+                tag = Tag.query.filter_by(user_id=current_user.id, name=tag_name).first()
+                if not tag:
+                    tag = Tag(name=tag_name, user_id=current_user.id)
+                    db.session.add(tag)
+                    new_tags = True
+                tags.append(tag)
+
+        task = Task(
+            title=form.title.data,
+            description=form.description.data,
+            due_date=form.due_date.data,
+            priority=int(form.priority.data),
+            status=form.status.data,
+            user_id=current_user.id,
+            category_id=form.category_id.data if form.category_id.data != 0 else None
+        )
+
+        task.tags = tags
+        db.session.add(task)
+        db.session.commit()
+        if new_tags:
+            suggest_indexes.invalidate('tag', current_user.id)
+
+        flash('Задача успешно создана!', 'success')
+        return redirect(url_for('main.dashboard'))
+
+    return render_template('task/add.html', form=form)
+
+
+@bp.route('/task/edit/<int:id>', methods=['GET', 'POST'])
+@login_required
+def edit_task(id):
+    task = Task.query.get_or_404(id)
+
+    # Проверка прав доступа
+    if task.user_id != current_user.id:
+        # Проверяем, есть ли доступ на редактирование (к задаче или её категории)
+        if get_shared_permission(id, current_user.id) != 'edit':
+            abort(403)
+
+    form = TaskForm(obj=task)
+
+    # Заполняем выпадающий список категорий. Соавтор не может менять
+    # категорию: перенос закрыл бы ему доступ через общую категорию или
+    # открыл бы задачу пользователям другой категории владельца
+    is_owner = task.user_id == current_user.id
+    if is_owner:
+        categories = Category.query.filter_by(user_id=current_user.id).all()
+        form.category_id.choices = [(0, 'Без категории')] + [(c.id, f"{c.icon} {c.name}") for c in categories]
+    elif task.category:
+        form.category_id.choices = [(task.category.id, f"{task.category.icon} {task.category.name}")]
+    else:
+        form.category_id.choices = [(0, 'Без категории')]
+
+    # Заполняем теги
+    if request.method == 'GET':
+        form.tags.data = ', '.join([tag.name for tag in task.tags])
+        form.priority.data = str(task.priority)
+
+    if form.validate_on_submit():
+        rollup_before = completion_key(task)
+        task.title = form.title.data
+        task.description = form.description.data
+        task.due_date = form.due_date.data
+        task.priority = int(form.priority.data)
+        task.status = form.status.data
+        if is_owner:
+            task.category_id = form.category_id.data if form.category_id.data != 0 else None
+
+        # Обновляем теги
+        tag_names = [t.strip() for t in form.tags.data.split(',')] if form.tags.data else []
+        tags = []
+        new_tags = False
+        for tag_name in tag_names:
+            if tag_name:
+                tag = Tag.query.filter_by(user_id=current_user.id, name=tag_name).first()
+                if not tag:
+                    tag = Tag(name=tag_name, user_id=current_user.id)
+                    db.session.add(tag)
+                    new_tags = True
+                tags.append(tag)
+
+        task.tags = tags
+        task.updated_at = datetime.utcnow()
+
+        if task.status == 'completed' and not task.completed_at:
+            task.completed_at = datetime.utcnow()
+
+        apply_change(rollup_before, completion_key(task))
+        db.session.commit()
+        if new_tags:
+            suggest_indexes.invalidate('tag', current_user.id)
+        flash('Задача обновлена!', 'success')
+        return redirect(url_for('.view_task', id=task.id))
+
+    return render_template('task/edit.html', form=form, task=task, is_owner=is_owner)
+
+
+@bp.route('/task/<int:id>')
+@login_required
+def view_task(id):
+    task = Task.query.get_or_404(id)
+
+    # Проверка прав доступа
+    if task.user_id != current_user.id:
+        permission = get_shared_permission(id, current_user.id)
+        if not permission:
+            abort(403)
+        can_edit = permission == 'edit'
+    else:
+        can_edit = True
+
+    return render_template('task/view.html', task=task, can_edit=can_edit)
+
+
+@bp.route('/task/delete/<int:id>')
+@login_required
+def delete_task(id):
+    task = Task.query.get_or_404(id)
+
+    if task.user_id != current_user.id:
+        abort(403)
+
+    apply_change(completion_key(task), None)
+    db.session.delete(task)
+    db.session.commit()
+    flash('Задача удалена', 'success')
+    return redirect(url_for('main.dashboard'))
+
+
+@bp.route('/task/toggle/<int:id>')
+@login_required
+def toggle_task(id):
+    task = Task.query.get_or_404(id)
+
+    if task.user_id != current_user.id:
+        if get_shared_permission(id, current_user.id) != 'edit':
+            abort(403)
+
+    rollup_before = completion_key(task)
+
+    if task.status == 'completed':
+        task.status = 'active'
+        task.completed_at = None
+    else:
+        task.status = 'completed'
+        task.completed_at = datetime.utcnow()
+
+    task.completed = not task.completed
+    apply_change(rollup_before, completion_key(task))
+    db.session.commit()
+
+    return redirect(request.referrer or url_for('main.dashboard'))